@@ -0,0 +1,118 @@
+"""
+Run the same notebook workload against SQLite and Postgres.
+
+By default the SQLite run uses a temporary WAL database created from the models, and
+the Postgres run uses `DATABASE_URL` (migrations must be applied). Pass `--sqlite-only`
+on machines without Postgres. Each phase reports operations per second: creating
+notebooks, adding steps from concurrent threads, reading notebooks and step lists
+from concurrent threads, and reordering steps.
+
+Usage:
+    poetry run python -m benchmarks.bench_backends --threads 8 --notebooks 20
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, SQLModel
+
+from src.api.notebook.service import NotebookService
+from src.config import get_settings
+from src.db.database import create_db_engine
+
+
+def timed(label: str, operations: int, function) -> None:
+    started = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<14} {operations / elapsed:9.0f} ops/s")
+
+
+def run(name: str, engine: Engine, threads: int, notebooks: int, steps: int) -> None:
+    print(f"{name} ({engine.url.render_as_string()})")
+    notebook_ids = []
+
+    def create_notebooks():
+        for i in range(notebooks):
+            with Session(engine) as session:
+                notebook = NotebookService(session).create_notebook(f"bench-{i}")
+                notebook_ids.append(notebook.id)
+
+    def add_step(new_step):
+        with Session(engine) as session:
+            NotebookService(session).add_notebook_step(*new_step)
+
+    def add_steps():
+        new_steps = [
+            (order_id, notebook_id)
+            for order_id in range(1, steps + 1)
+            for notebook_id in notebook_ids
+        ]
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(add_step, new_steps))
+
+    def read(notebook_id):
+        with Session(engine) as session:
+            service = NotebookService(session)
+            service.get_notebook_by_id(notebook_id)
+            service.get_notebook_steps(notebook_id)
+
+    def reads():
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(read, notebook_ids * 20))
+
+    def reorder(notebook_id):
+        with Session(engine) as session:
+            service = NotebookService(session)
+            current_steps = service.get_notebook_steps(notebook_id)
+            order_ids = random.sample(range(1, 101), len(current_steps))
+            service.reorder_notebook_steps(
+                [
+                    {"step_id": step.step_id, "order_id": order_id}
+                    for step, order_id in zip(current_steps, order_ids)
+                ],
+                notebook_id,
+            )
+
+    def reorders():
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(reorder, notebook_ids))
+
+    try:
+        timed("create", notebooks, create_notebooks)
+        timed("add steps", notebooks * steps, add_steps)
+        timed("read", notebooks * 20, reads)
+        timed("reorder", notebooks, reorders)
+    finally:
+        with Session(engine) as session:
+            NotebookService(session).delete_notebooks(notebook_ids)
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--notebooks", type=int, default=20)
+    parser.add_argument("--steps", type=int, default=50, help="Steps per notebook.")
+    parser.add_argument("--sqlite-only", action="store_true")
+    args = parser.parse_args()
+    steps = min(args.steps, 100)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_db_engine(f"sqlite:///{Path(directory) / 'notebook.db'}")
+        SQLModel.metadata.create_all(engine)
+        run("SQLite", engine, args.threads, args.notebooks, steps)
+
+    database_url = get_settings().DATABASE_URL
+    if not args.sqlite_only and not database_url.startswith("sqlite"):
+        engine = create_db_engine(database_url)
+        run("Postgres", engine, args.threads, args.notebooks, steps)
+
+
+if __name__ == "__main__":
+    main()
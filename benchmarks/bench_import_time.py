@@ -0,0 +1,120 @@
+"""
+Check that importing the app only loads what FastAPI and SQLModel already need.
+
+Imports `src.main` in fresh interpreters with `-X importtime`, next to a baseline of
+a bare `import fastapi, sqlmodel`, and reports the best import time of each, their
+ratio and the slowest modules of the app. It exits with an error when the app pulls
+in a top-level package that the baseline does not, other than the app itself and its
+settings (`ALLOWED_PACKAGES`). Database drivers and the production server are only
+needed once the app starts, so importing them at import time fails the check.
+
+Comparing against the baseline keeps the check independent of the machine. On a
+noisy single-CPU machine, with `-X importtime` on, the best of ten runs of the app
+varied between about 710 and 850 ms and the baseline between about 580 and 670 ms,
+a ratio of 1.16 to 1.27 (so absolute budgets there cannot tell changes from noise).
+The difference is mostly FastAPI's OpenAPI models, loaded when the app is built, and
+the app's own modules; servers load the app as `src.main:app`, so neither can be
+deferred. Making the engine and settings lazy did not measurably change the total.
+Pass `--max-ratio` to also fail when the app takes more than that multiple of the
+baseline.
+
+Usage:
+    poetry run python -m benchmarks.bench_import_time --max-ratio 1.4
+"""
+
+import argparse
+import subprocess
+import sys
+
+BASELINE = "fastapi, sqlmodel"
+
+ALLOWED_PACKAGES = (
+    "src",
+    "pydantic_settings",
+    "dotenv",
+)
+
+PROBE = """
+import sys
+import time
+
+before = set(sys.modules)
+started = time.perf_counter()
+import {modules}
+elapsed = time.perf_counter() - started
+print(round(elapsed * 1e6))
+print(*sorted(set(sys.modules) - before))
+"""
+
+
+def measure(modules: str) -> tuple[int, set[str], dict[str, int]]:
+    """
+    Import modules in a fresh interpreter and parse the `-X importtime` report.
+
+    Args:
+        modules (str): The modules to import, as written after `import`.
+
+    Returns:
+        tuple[int, set[str], dict[str, int]]: The time taken by the import in
+                                              microseconds, the top-level packages
+                                              it loaded outside the standard
+                                              library, and the self time of every
+                                              imported module in microseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(modules=modules)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed_us, loaded = result.stdout.splitlines()
+    packages = {name.split(".")[0] for name in loaded.split()}
+    packages -= set(sys.stdlib_module_names)
+
+    self_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        self_times[name.strip()] = int(self_us)
+    return int(elapsed_us), packages, self_times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="src.main")
+    parser.add_argument("--max-ratio", type=float, default=None)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    # Alternate the two imports so that noise affects both alike
+    app_runs, baseline_runs = [], []
+    for _ in range(args.runs):
+        app_runs.append(measure(args.module))
+        baseline_runs.append(measure(BASELINE))
+    elapsed, packages, self_times = min(app_runs, key=lambda run: run[0])
+    baseline_elapsed, baseline_packages, _ = min(baseline_runs, key=lambda run: run[0])
+    ratio = elapsed / baseline_elapsed
+
+    print(f"import {args.module}: {elapsed / 1000:.1f} ms (best of {args.runs})")
+    print(f"import {BASELINE}: {baseline_elapsed / 1000:.1f} ms (best of {args.runs})")
+    print(f"ratio: {ratio:.2f}")
+    slowest = sorted(self_times.items(), key=lambda item: -item[1])[: args.top]
+    for name, self_us in slowest:
+        print(f"  {self_us / 1000:7.1f} ms  {name}")
+
+    failed = False
+    extra = sorted(packages - baseline_packages - set(ALLOWED_PACKAGES))
+    if extra:
+        print(f"Packages that should be imported lazily: {', '.join(extra)}")
+        failed = True
+    if args.max_ratio is not None and ratio > args.max_ratio:
+        print(f"Import time exceeds {args.max_ratio:.2f} times the baseline")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Compare the per-query cost of the hot service queries on psycopg2 and psycopg 3.
+
+Runs against the Postgres database configured by `DATABASE_URL` (migrations must be
+applied). App-side cost is the client process CPU time per query. DB-side cost is the
+planning and execution time per call reported by `pg_stat_statements` for the
+notebook queries this user runs in this database, taken as the difference between
+readings before and after each run (so other clients on the same database should be
+idle). It is skipped when the extension is not installed (enable
+`pg_stat_statements.track_planning` to include planning time). The benchmark's own
+notebook is deleted and purged afterwards.
+
+Usage:
+    poetry run python -m benchmarks.bench_prepared_statements --queries 5000
+"""
+
+import argparse
+import time
+
+from sqlalchemy import URL, make_url, text
+from sqlmodel import Session
+
+from src.api.notebook.service import NotebookService
+from src.config import get_settings
+from src.db.database import StatementCacheStats, create_db_engine
+
+
+def read_db_time(session: Session) -> tuple[int, float] | None:
+    try:
+        calls, milliseconds = session.execute(
+            text(
+                "SELECT COALESCE(SUM(calls), 0), "
+                "COALESCE(SUM(total_plan_time + total_exec_time), 0) "
+                "FROM pg_stat_statements "
+                "WHERE userid = (SELECT oid FROM pg_roles WHERE rolname = current_user) "
+                "AND dbid = (SELECT oid FROM pg_database "
+                "WHERE datname = current_database()) "
+                "AND query LIKE '%notebook%' "
+                "AND query NOT LIKE '%pg_stat_statements%'"
+            )
+        ).one()
+    except Exception:
+        session.rollback()
+        return None
+    session.commit()
+    return int(calls), float(milliseconds)
+
+
+def run(database_url: URL, driver: str, notebook_id: str, queries: int) -> None:
+    # Name the driver in the URL, since a driver already in DATABASE_URL wins
+    engine = create_db_engine(database_url.set(drivername=f"postgresql+{driver}"))
+    stats = StatementCacheStats(engine)
+
+    with Session(engine) as session:
+        service = NotebookService(session)
+        db_time_before = read_db_time(session)
+
+        started = time.process_time()
+        for _ in range(queries):
+            service.get_notebook_by_id(notebook_id)
+            service.get_notebook_steps(notebook_id)
+            session.commit()
+        app_cpu = time.process_time() - started
+
+        db_time_after = read_db_time(session)
+
+    engine.dispose()
+
+    line = f"{driver:>9}: app CPU {app_cpu / (queries * 2) * 1e6:7.1f} us/query"
+    if db_time_before is not None and db_time_after is not None:
+        calls = db_time_after[0] - db_time_before[0]
+        milliseconds = db_time_after[1] - db_time_before[1]
+        line += f"  DB {milliseconds / max(calls, 1) * 1000:7.1f} us/call"
+    else:
+        line += "  DB n/a (pg_stat_statements not installed)"
+    print(f"{line}  statement cache {stats.as_dict()}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--steps", type=int, default=50)
+    args = parser.parse_args()
+
+    database_url = make_url(get_settings().DATABASE_URL)
+    if database_url.get_backend_name() != "postgresql":
+        parser.error("DATABASE_URL must point to a Postgres database")
+
+    engine = create_db_engine(database_url)
+    with Session(engine) as session:
+        notebook_id = NotebookService(session).create_notebook("bench").id
+    for order_id in range(1, min(args.steps, 100) + 1):
+        with Session(engine) as session:
+            NotebookService(session).add_notebook_step(order_id, notebook_id)
+
+    try:
+        for driver in ("psycopg2", "psycopg"):
+            run(database_url, driver, notebook_id, args.queries)
+    finally:
+        with Session(engine) as session:
+            service = NotebookService(session)
+            service.delete_notebook(notebook_id)
+            while service.purge_notebook(notebook_id):
+                pass
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
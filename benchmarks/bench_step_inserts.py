@@ -0,0 +1,83 @@
+"""
+Compare step insert latency and throughput with and without write batching.
+
+Runs against the database configured by `DATABASE_URL` (migrations must be applied).
+Each worker thread mimics a request: it opens a session, adds one step through
+`NotebookService` and closes the session. The notebooks created by the benchmark are
+deleted and purged afterwards.
+
+Usage:
+    poetry run python -m benchmarks.bench_step_inserts --threads 32 --notebooks 20
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlmodel import Session
+
+from src.api.notebook.service import NotebookService
+from src.config import get_settings
+from src.db.database import get_engine
+
+
+def create_notebooks(count: int) -> list[str]:
+    notebook_ids = []
+    for i in range(count):
+        with Session(get_engine()) as session:
+            notebook = NotebookService(session).create_notebook(f"bench-{i}")
+            notebook_ids.append(notebook.id)
+    return notebook_ids
+
+
+def add_step(order_id: int, notebook_id: str) -> float:
+    started = time.perf_counter()
+    with Session(get_engine()) as session:
+        NotebookService(session).add_notebook_step(order_id, notebook_id)
+    return time.perf_counter() - started
+
+
+def run(batching: bool, threads: int, notebooks: int, steps: int) -> None:
+    get_settings().STEP_WRITE_BATCHING = batching
+    notebook_ids = create_notebooks(notebooks)
+    new_steps = [
+        (order_id, notebook_id)
+        for order_id in range(1, steps + 1)
+        for notebook_id in notebook_ids
+    ]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = list(executor.map(lambda new_step: add_step(*new_step), new_steps))
+    elapsed = time.perf_counter() - started
+
+    with Session(get_engine()) as session:
+        service = NotebookService(session)
+        service.delete_notebooks(notebook_ids)
+        for notebook_id in notebook_ids:
+            while service.purge_notebook(notebook_id):
+                pass
+
+    latencies.sort()
+    print(
+        f"{'batched' if batching else 'unbatched':>9}: "
+        f"{len(new_steps) / elapsed:8.0f} steps/s  "
+        f"p50 {statistics.median(latencies) * 1000:6.2f} ms  "
+        f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:6.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--notebooks", type=int, default=20)
+    parser.add_argument("--steps", type=int, default=100, help="Steps per notebook.")
+    args = parser.parse_args()
+
+    for batching in (False, True):
+        run(batching, args.threads, args.notebooks, min(args.steps, 100))
+
+
+if __name__ == "__main__":
+    main()
@@ -19,9 +19,19 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 # from src.db.database import SQLModel
 from src.api.notebook.models import Notebook
+from src.config import get_settings
+from src.db.database import get_database_url
 
 target_metadata = SQLModel.metadata
 
+# Migrate the database the app is configured for rather than the URL in alembic.ini
+settings = get_settings()
+database_url = get_database_url(settings.DATABASE_URL, settings.DATABASE_DRIVER)
+config.set_main_option(
+    "sqlalchemy.url",
+    database_url.render_as_string(hide_password=False).replace("%", "%%"),
+)
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -46,6 +56,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        render_as_batch=url.startswith("sqlite"),
     )
 
     with context.begin_transaction():
@@ -66,7 +77,13 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        # SQLite cannot alter most table properties in place; batch mode recreates
+        # the table instead
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
 
         with context.begin_transaction():
             context.run_migrations()
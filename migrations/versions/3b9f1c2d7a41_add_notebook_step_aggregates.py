@@ -0,0 +1,57 @@
+"""Add notebook step aggregates
+
+Revision ID: 3b9f1c2d7a41
+Revises: e23f2257632b
+Create Date: 2026-10-19 09:12:04.118532
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "3b9f1c2d7a41"
+down_revision: Union[str, None] = "e23f2257632b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "notebook",
+        sa.Column("step_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "notebook",
+        sa.Column("last_step_modified_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        op.f("ix_notebookstep_notebook_id"),
+        "notebookstep",
+        ["notebook_id"],
+        unique=False,
+    )
+
+    # Backfill the aggregates for existing notebooks. Large tables should use
+    # `make repair-notebook-aggregates` instead, which works in batches.
+    op.execute(
+        """
+        UPDATE notebook
+        SET step_count = (
+                SELECT COUNT(*) FROM notebookstep
+                WHERE notebookstep.notebook_id = notebook.id
+            ),
+            last_step_modified_at = (
+                SELECT MAX(notebookstep.modified_at) FROM notebookstep
+                WHERE notebookstep.notebook_id = notebook.id
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_notebookstep_notebook_id"), table_name="notebookstep")
+    with op.batch_alter_table("notebook") as batch_op:
+        batch_op.drop_column("last_step_modified_at")
+        batch_op.drop_column("step_count")
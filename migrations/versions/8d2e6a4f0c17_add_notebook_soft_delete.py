@@ -0,0 +1,47 @@
+"""Add notebook soft delete
+
+Revision ID: 8d2e6a4f0c17
+Revises: 3b9f1c2d7a41
+Create Date: 2026-10-19 11:40:52.604117
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "8d2e6a4f0c17"
+down_revision: Union[str, None] = "3b9f1c2d7a41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "notebook",
+        sa.Column("deleted_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        "ix_notebook_live_id",
+        "notebook",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("deleted_at IS NULL"),
+        sqlite_where=sa.text("deleted_at IS NULL"),
+    )
+    op.create_index(
+        "ix_notebook_deleted_at",
+        "notebook",
+        ["deleted_at"],
+        unique=False,
+        postgresql_where=sa.text("deleted_at IS NOT NULL"),
+        sqlite_where=sa.text("deleted_at IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_notebook_deleted_at", table_name="notebook")
+    op.drop_index("ix_notebook_live_id", table_name="notebook")
+    with op.batch_alter_table("notebook") as batch_op:
+        batch_op.drop_column("deleted_at")
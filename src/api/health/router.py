@@ -0,0 +1,52 @@
+from fastapi import APIRouter, HTTPException, Request
+
+from src.api.health.schemas import (
+    HealthResponse,
+    ReadinessResponse,
+    StatementCacheResponse,
+)
+from src.db.database import get_statement_cache_stats
+
+router = APIRouter()
+
+
+@router.get("/live", response_model=HealthResponse)
+def get_liveness():
+    """
+    Report that the process is up and serving requests.
+
+    Returns:
+        The liveness status.
+    """
+    return HealthResponse(status="ok")
+
+
+@router.get("/ready", response_model=ReadinessResponse)
+def get_readiness(request: Request):
+    """
+    Report whether the app can take traffic.
+
+    The app becomes ready once the database connection pool has been warmed up. The
+    response also carries the compiled statement cache statistics of the engine, so
+    a cache too small for the application's queries shows up in monitoring.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        The readiness status.
+
+    Raises:
+        HTTPException: If the app is not ready yet.
+    """
+    if not getattr(request.app.state, "ready", False):
+        raise HTTPException(status_code=503, detail="Not ready")
+    statement_cache_stats = get_statement_cache_stats()
+    return ReadinessResponse(
+        status="ready",
+        statement_cache=(
+            StatementCacheResponse(**statement_cache_stats.as_dict())
+            if statement_cache_stats is not None
+            else None
+        ),
+    )
@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+
+
+class HealthResponse(BaseModel):
+    """
+    Schema for health probe output representation.
+    """
+
+    status: str
+
+
+class StatementCacheResponse(BaseModel):
+    """
+    Schema for compiled statement cache statistics output representation.
+    """
+
+    size: int
+    capacity: int
+    hits: int
+    misses: int
+    hit_ratio: float | None
+
+
+class ReadinessResponse(HealthResponse):
+    """
+    Schema for readiness probe output representation.
+    """
+
+    statement_cache: StatementCacheResponse | None = None
@@ -0,0 +1,89 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from src.api.notebook.models import Notebook
+from src.db.database import StatementCacheStats
+from src.main import app
+
+
+def wait_for_readiness(client, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    response = client.get("/health/ready")
+    while response.status_code != 200 and time.monotonic() < deadline:
+        time.sleep(0.01)
+        response = client.get("/health/ready")
+    return response
+
+
+@pytest.fixture
+def warm_up_calls(monkeypatch):
+    """Fixture replacing the database warm-up with a recorder"""
+    calls = []
+    monkeypatch.setattr("src.main.warm_up_engine", calls.append)
+    monkeypatch.setattr("src.main.dispose_engine", lambda: None)
+    return calls
+
+
+def test_liveness():
+    """Test the GET /health/live route"""
+    response = TestClient(app).get("/health/live")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+def test_not_ready_before_startup():
+    """Test the GET /health/ready route before the app has started"""
+    response = TestClient(app).get("/health/ready")
+    assert response.status_code == 503
+    assert response.json() == {"detail": "Not ready"}
+
+
+def test_ready_after_warm_up(warm_up_calls):
+    """Test the GET /health/ready route once the pool has been warmed up"""
+    with TestClient(app) as client:
+        response = wait_for_readiness(client)
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready", "statement_cache": None}
+    assert warm_up_calls == [2]
+
+
+def test_ready_reports_statement_cache_stats(sqlite_engine, warm_up_calls, monkeypatch):
+    """Test the GET /health/ready route reports the compiled statement cache"""
+    stats = StatementCacheStats(sqlite_engine)
+    with Session(sqlite_engine) as session:
+        for notebook_id in ("1", "2"):
+            session.exec(select(Notebook).where(Notebook.id == notebook_id)).all()
+    monkeypatch.setattr(
+        "src.api.health.router.get_statement_cache_stats", lambda: stats
+    )
+
+    with TestClient(app) as client:
+        response = wait_for_readiness(client)
+
+    assert response.status_code == 200
+    assert response.json()["statement_cache"] == {
+        "size": stats.size,
+        "capacity": 500,
+        "hits": 1,
+        "misses": 1,
+        "hit_ratio": 0.5,
+    }
+
+
+def test_not_ready_while_database_unreachable(monkeypatch):
+    """Test the GET /health/ready route while the warm-up keeps failing"""
+
+    def fail_warm_up(connections):
+        raise ConnectionError("database unreachable")
+
+    monkeypatch.setattr("src.main.warm_up_engine", fail_warm_up)
+    monkeypatch.setattr("src.main.dispose_engine", lambda: None)
+
+    with TestClient(app) as client:
+        response = wait_for_readiness(client, timeout=0.2)
+
+    assert response.status_code == 503
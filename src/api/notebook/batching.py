@@ -0,0 +1,187 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Tuple
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from src.api.notebook.models import NotebookStep
+from src.api.notebook.service import NotebookService
+from src.config import get_settings
+
+PendingStep = Tuple[int, str, Future]
+
+
+class StepWriteBatcher:
+    """
+    Coalesces concurrent step inserts into shared transactions (group commit).
+
+    Callers block in `add_notebook_step` while a background thread collects inserts
+    for up to `max_wait` seconds or `max_items` inserts, whichever comes first, and
+    writes them with `NotebookService.add_notebook_steps` in one transaction. Each
+    caller still receives its own step or its own error. Once closed, the batcher
+    rejects new inserts.
+    """
+
+    def __init__(
+        self, engine: Engine, max_items: int = 64, max_wait: float = 0.005
+    ) -> None:
+        """
+        Initialize the batcher. The flush thread is started on first use.
+
+        Args:
+            engine (Engine): The engine the batches are written with.
+            max_items (int): The most inserts flushed in one transaction.
+            max_wait (float): Seconds a batch waits for more inserts before flushing.
+        """
+        self.engine = engine
+        self.max_items = max_items
+        self.max_wait = max_wait
+        self._queue: "queue.Queue[PendingStep | None]" = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def add_notebook_step(self, order_id: int, notebook_id: str) -> NotebookStep:
+        """
+        Queue a step insert and wait for the batch containing it to be written.
+
+        Args:
+            order_id (int): The order ID of the new step.
+            notebook_id (str): The unique identifier of the notebook.
+
+        Returns:
+            NotebookStep: The newly created notebook step.
+
+        Raises:
+            HTTPException: If the step was rejected by validation.
+            RuntimeError: If the batcher is closed or the batch could not be written.
+        """
+        future: Future = Future()
+        # Queue under the lock so that nothing lands behind the stop sentinel
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The step write batcher is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="step-write-batcher", daemon=True
+                )
+                self._thread.start()
+            self._queue.put((order_id, notebook_id, future))
+        return future.result()
+
+    def close(self) -> None:
+        """
+        Reject new inserts, flush the ones that are already queued and stop the flush
+        thread.
+        """
+        with self._lock:
+            self._closed = True
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join()
+                self._thread = None
+
+        # Fail anything the flush thread did not pick up rather than leave it waiting
+        while True:
+            try:
+                pending = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if pending is not None:
+                pending[2].set_exception(
+                    RuntimeError("The step write batcher is closed")
+                )
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch = [first]
+            stopping = False
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_items:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    pending = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if pending is None:
+                    stopping = True
+                    break
+                batch.append(pending)
+
+            self._flush(batch)
+            if stopping:
+                return
+
+    def _flush(self, batch: List[PendingStep]) -> None:
+        new_steps = [(order_id, notebook_id) for order_id, notebook_id, _ in batch]
+        try:
+            with Session(self.engine, expire_on_commit=False) as session:
+                results = NotebookService(session).add_notebook_steps(new_steps)
+        except Exception as exc:
+            logging.exception("Failed to write a batch of %d steps", len(batch))
+            # Each caller raises and annotates its own exception, so do not share one
+            for _, _, future in batch:
+                error = RuntimeError(f"Failed to write a batch of {len(batch)} steps")
+                error.__cause__ = exc
+                future.set_exception(error)
+            return
+
+        for (_, _, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+_batchers: Dict[Engine, StepWriteBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_step_write_batcher(engine: Engine) -> StepWriteBatcher:
+    """
+    Return the process-wide step write batcher of an engine, creating it from the
+    settings.
+
+    Args:
+        engine (Engine): The engine the steps are written with.
+
+    Returns:
+        StepWriteBatcher: The batcher shared by every writer using the engine.
+    """
+    batcher = _batchers.get(engine)
+    if batcher is None:
+        with _batchers_lock:
+            batcher = _batchers.get(engine)
+            if batcher is None:
+                settings = get_settings()
+                batcher = StepWriteBatcher(
+                    engine,
+                    max_items=settings.STEP_WRITE_BATCH_MAX_ITEMS,
+                    max_wait=settings.STEP_WRITE_BATCH_MAX_WAIT_MS / 1000,
+                )
+                _batchers[engine] = batcher
+    return batcher
+
+
+def close_step_write_batchers() -> None:
+    """
+    Flush and stop the process-wide step write batchers that were started.
+    """
+    with _batchers_lock:
+        while _batchers:
+            _, batcher = _batchers.popitem()
+            batcher.close()
+
+
+atexit.register(close_step_write_batchers)
@@ -0,0 +1,123 @@
+import argparse
+import logging
+import time
+
+from sqlmodel import Session
+
+from src.api.notebook.service import NotebookService
+from src.db.database import get_engine
+
+
+def rebuild_notebook_aggregates(batch_size: int = 500) -> int:
+    """
+    Repair the denormalized step aggregates stored on every notebook.
+
+    Args:
+        batch_size (int): The number of notebooks to repair per transaction.
+
+    Returns:
+        int: The number of notebooks whose aggregates were out of date.
+    """
+    with Session(get_engine()) as session:
+        return NotebookService(session).rebuild_notebook_aggregates(batch_size)
+
+
+def purge_deleted_notebooks(
+    batch_size: int = 500,
+    throttle: float = 0.1,
+    poll_interval: float = 10.0,
+    run_forever: bool = False,
+) -> int:
+    """
+    Purge the steps and rows of deleted notebooks in small, throttled batches.
+
+    Every batch runs in its own short transaction, so `notebookstep` is never locked
+    for long and replicas can keep up. All state lives in the database (the
+    `deleted_at` marker and the remaining rows), so the worker resumes where it left
+    off after a restart.
+
+    Args:
+        batch_size (int): The maximum number of steps deleted per transaction.
+        throttle (float): Seconds to sleep between batches.
+        poll_interval (float): Seconds to wait for new deletions when idle.
+        run_forever (bool): Keep polling for new deletions instead of exiting once
+                            the backlog is empty.
+
+    Returns:
+        int: The number of notebooks purged.
+    """
+    purged_notebooks = 0
+    while True:
+        with Session(get_engine()) as session:
+            notebook_ids = NotebookService(session).get_notebooks_pending_purge()
+
+        if not notebook_ids:
+            if not run_forever:
+                return purged_notebooks
+            time.sleep(poll_interval)
+            continue
+
+        for notebook_id in notebook_ids:
+            while True:
+                with Session(get_engine()) as session:
+                    service = NotebookService(session)
+                    purged_steps = service.purge_notebook(notebook_id, batch_size)
+                    if purged_steps is None:
+                        # Already purged, e.g. by another worker
+                        break
+                    notebooks_left, steps_left = service.get_purge_backlog()
+
+                if purged_steps:
+                    logging.info(
+                        "Purged %d steps of notebook %s; %d notebooks and %d steps left",
+                        purged_steps,
+                        notebook_id,
+                        notebooks_left,
+                        steps_left,
+                    )
+                else:
+                    purged_notebooks += 1
+                    logging.info(
+                        "Purged notebook %s; %d notebooks and %d steps left",
+                        notebook_id,
+                        notebooks_left,
+                        steps_left,
+                    )
+
+                time.sleep(throttle)
+                if not purged_steps:
+                    break
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Notebook maintenance jobs.")
+    subparsers = parser.add_subparsers(dest="job", required=True)
+
+    rebuild_parser = subparsers.add_parser(
+        "rebuild-aggregates", help="Rebuild notebook step aggregates in batches."
+    )
+    rebuild_parser.add_argument("--batch-size", type=int, default=500)
+
+    purge_parser = subparsers.add_parser(
+        "purge-deleted", help="Purge deleted notebooks and their steps."
+    )
+    purge_parser.add_argument("--batch-size", type=int, default=500)
+    purge_parser.add_argument("--throttle", type=float, default=0.1)
+    purge_parser.add_argument("--poll-interval", type=float, default=10.0)
+    purge_parser.add_argument("--forever", action="store_true")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.job == "rebuild-aggregates":
+        repaired = rebuild_notebook_aggregates(args.batch_size)
+        logging.info("Repaired aggregates for %d notebooks", repaired)
+    elif args.job == "purge-deleted":
+        purged = purge_deleted_notebooks(
+            args.batch_size, args.throttle, args.poll_interval, args.forever
+        )
+        logging.info("Purged %d notebooks", purged)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import datetime
-from typing import List
+from typing import List, Optional
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -11,7 +12,7 @@ class NotebookStep(SQLModel, table=True):
     Attributes:
         step_id (int): Unique identifier for the notebook step(primary key).
         order_id (int): The order id for the step.
-        notebook_id (int): The associated notebook id for the step.
+        notebook_id (str): The associated notebook id for the step.
         created_at (datetime.datetime): Timestamp when the notebook was created.
                                         Defaults to the current UTC time.
         modified_at (datetime.datetime): Timestamp when the notebook was last modified.
@@ -20,7 +21,7 @@ class NotebookStep(SQLModel, table=True):
 
     step_id: int = Field(primary_key=True, index=True)
     order_id: int
-    notebook_id: int = Field(foreign_key="notebook.id")
+    notebook_id: str = Field(foreign_key="notebook.id", index=True)
     created_at: datetime.datetime = Field(
         default_factory=lambda: datetime.datetime.now(tz=datetime.timezone.utc),
         description="Timestamp when the notebook step was created. Defaults to the current UTC time.",
@@ -44,8 +45,30 @@ class Notebook(SQLModel, table=True):
                                         Defaults to the current UTC time.
         modified_at (datetime.datetime): Timestamp when the notebook was last modified.
                                          Defaults to the current UTC time.
+        step_count (int): Number of steps in the notebook. Maintained by the service
+                          write paths so it never needs to be computed from the steps.
+        last_step_modified_at (datetime.datetime | None): Timestamp of the most recent
+                                                          step change, if any.
+        deleted_at (datetime.datetime | None): Timestamp when the notebook was deleted.
+                                               Deleted notebooks are hidden from reads
+                                               and purged in the background.
     """
 
+    __table_args__ = (
+        Index(
+            "ix_notebook_live_id",
+            "id",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_notebook_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+            sqlite_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
+
     id: str = Field(
         primary_key=True, index=True, description="Unique identifier for the notebook."
     )
@@ -58,4 +81,15 @@ class Notebook(SQLModel, table=True):
         default_factory=lambda: datetime.datetime.now(tz=datetime.timezone.utc),
         description="Timestamp when the notebook was last modified. Defaults to the current UTC time.",
     )
+    step_count: int = Field(
+        default=0, description="Number of steps in the notebook. Defaults to 0."
+    )
+    last_step_modified_at: Optional[datetime.datetime] = Field(
+        default=None,
+        description="Timestamp of the most recent step change. None if the notebook has no steps.",
+    )
+    deleted_at: Optional[datetime.datetime] = Field(
+        default=None,
+        description="Timestamp when the notebook was deleted. None if the notebook is live.",
+    )
     steps: List[NotebookStep] = Relationship(back_populates="notebook")
@@ -5,6 +5,8 @@ from fastapi import APIRouter, Depends, HTTPException
 
 from src.api.notebook.models import NotebookStep
 from src.api.notebook.schemas import (
+    BulkDeleteNotebooksRequest,
+    BulkDeleteNotebooksResponse,
     CreateNotebook,
     CreateNotebookStep,
     NotebookResponse,
@@ -50,6 +52,26 @@ def create_notebook(
     return NotebookResponse(**notebook.model_dump())
 
 
+@router.post("/bulk-delete", response_model=BulkDeleteNotebooksResponse)
+def delete_notebooks(
+    input: BulkDeleteNotebooksRequest, notebook_service: NotebookService = Depends()
+):
+    """
+    Delete several notebooks at once.
+
+    The notebooks are hidden immediately and purged in the background.
+
+    Args:
+        input (BulkDeleteNotebooksRequest): The IDs of the notebooks to delete.
+        notebook_service (NotebookService): The service handling notebook deletion.
+
+    Returns:
+        The IDs of the notebooks that were deleted.
+    """
+    deleted_ids = notebook_service.delete_notebooks(input.ids)
+    return BulkDeleteNotebooksResponse(deleted_ids=deleted_ids)
+
+
 @router.get("/{notebook_id}", response_model=NotebookResponse)
 def get_notebook(notebook_id: str, notebook_service: NotebookService = Depends()):
     """
@@ -71,6 +93,24 @@ def get_notebook(notebook_id: str, notebook_service: NotebookService = Depends()
     return NotebookResponse(**notebook.model_dump())
 
 
+@router.delete("/{notebook_id}", status_code=204)
+def delete_notebook(notebook_id: str, notebook_service: NotebookService = Depends()):
+    """
+    Delete a notebook by its unique ID.
+
+    The notebook is hidden immediately and purged in the background.
+
+    Args:
+        notebook_id (str): The unique identifier for the notebook.
+        notebook_service (NotebookService): The service handling notebook deletion.
+
+    Raises:
+        HTTPException: If the notebook with the specified ID is not found.
+    """
+    if not notebook_service.delete_notebook(notebook_id):
+        raise HTTPException(status_code=404, detail="Notebook not found")
+
+
 @router.post(
     "/{notebook_id}/steps", response_model=NotebookStepResponse, status_code=201
 )
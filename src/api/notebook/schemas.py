@@ -1,6 +1,7 @@
-from typing import List
+import datetime
+from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class CreateNotebook(BaseModel):
@@ -18,6 +19,24 @@ class NotebookResponse(BaseModel):
 
     id: str
     name: str
+    step_count: int = 0
+    last_step_modified_at: Optional[datetime.datetime] = None
+
+
+class BulkDeleteNotebooksRequest(BaseModel):
+    """
+    Schema for bulk notebook deletion input.
+    """
+
+    ids: List[str] = Field(min_length=1, max_length=1000)
+
+
+class BulkDeleteNotebooksResponse(BaseModel):
+    """
+    Schema for bulk notebook deletion output.
+    """
+
+    deleted_ids: List[str]
 
 
 class CreateNotebookStep(BaseModel):
@@ -1,13 +1,32 @@
 import datetime
+import functools
 import logging
 import uuid
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 from fastapi import Depends, HTTPException
-from sqlmodel import Session, select
+from sqlalchemy import delete, update
+from sqlmodel import Session, func, select
 
 from src.api.notebook.models import Notebook, NotebookStep
-from src.db.database import get_session
+from src.config import get_settings
+from src.db.database import get_session, serialized_writes
+
+MAX_STEPS_PER_NOTEBOOK = 100
+
+
+def serialized_write(method):
+    """
+    Run a service method's write transaction through `serialized_writes`, so writers
+    queue up instead of contending on single-writer databases such as SQLite.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with serialized_writes(self.session):
+            return method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class NotebookService:
@@ -34,7 +53,7 @@ class NotebookService:
         Returns:
             List[Notebook]: A list of all notebooks.
         """
-        statement = select(Notebook)
+        statement = select(Notebook).where(Notebook.deleted_at.is_(None))
         notebooks = self.session.exec(statement).all()
         return notebooks
 
@@ -48,10 +67,32 @@ class NotebookService:
         Returns:
             Notebook | None: The notebook with the specified ID, or None if not found.
         """
-        statement = select(Notebook).where(Notebook.id == notebook_id)
+        statement = select(Notebook).where(
+            Notebook.id == notebook_id, Notebook.deleted_at.is_(None)
+        )
         notebook = self.session.exec(statement).first()
         return notebook
 
+    def get_notebook_steps(self, notebook_id: str) -> List[NotebookStep]:
+        """
+        Retrieve the steps of a notebook.
+
+        The rows are fetched in the binary protocol when the driver supports it.
+
+        Args:
+            notebook_id (str): The unique identifier of the notebook.
+
+        Returns:
+            List[NotebookStep]: The steps of the notebook.
+        """
+        statement = (
+            select(NotebookStep)
+            .where(NotebookStep.notebook_id == notebook_id)
+            .execution_options(binary_fetch=True)
+        )
+        return list(self.session.exec(statement).all())
+
+    @serialized_write
     def create_notebook(self, name: str) -> Notebook:
         """
         Create a new notebook and save it to the database.
@@ -70,26 +111,121 @@ class NotebookService:
 
         return notebook
 
-    def add_notebook_step(self, order_id: int, notebook_id: str) -> NotebookStep:
-        query = select(NotebookStep).where(NotebookStep.notebook_id == notebook_id)
-        steps = self.session.exec(query).all()
+    def delete_notebook(self, notebook_id: str) -> bool:
+        """
+        Mark a notebook as deleted.
+
+        The notebook is hidden from reads immediately; its steps and row are removed
+        later by the background purge.
+
+        Args:
+            notebook_id (str): The unique identifier of the notebook.
+
+        Returns:
+            bool: True if the notebook was deleted, False if it was not found.
+        """
+        return bool(self.delete_notebooks([notebook_id]))
+
+    @serialized_write
+    def delete_notebooks(self, notebook_ids: List[str]) -> List[str]:
+        """
+        Mark several notebooks as deleted in a single statement.
+
+        Args:
+            notebook_ids (List[str]): The unique identifiers of the notebooks.
+
+        Returns:
+            List[str]: The IDs of the notebooks that were deleted. Unknown or already
+                       deleted notebooks are skipped.
+        """
+        statement = (
+            update(Notebook)
+            .where(Notebook.id.in_(notebook_ids), Notebook.deleted_at.is_(None))
+            .values(deleted_at=datetime.datetime.now(tz=datetime.timezone.utc))
+            .returning(Notebook.id)
+        )
+        deleted_ids = list(self.session.execute(statement).scalars().all())
+        self.session.commit()
+        return deleted_ids
 
-        if len(steps) >= 100:
+    def _get_notebook_for_update(self, notebook_id: str) -> Notebook:
+        """
+        Retrieve a notebook and lock its row until the current transaction ends.
+
+        Step writes go through this lock so the notebook aggregates stay consistent
+        with the steps table under concurrent writers.
+
+        Args:
+            notebook_id (str): The unique identifier of the notebook.
+
+        Returns:
+            Notebook: The locked notebook.
+
+        Raises:
+            HTTPException: If the notebook with the specified ID is not found.
+        """
+        statement = (
+            select(Notebook)
+            .where(Notebook.id == notebook_id, Notebook.deleted_at.is_(None))
+            .with_for_update()
+        )
+        notebook = self.session.exec(statement).first()
+        if notebook is None:
+            raise HTTPException(status_code=404, detail="Notebook not found")
+        return notebook
+
+    def _validate_new_step(
+        self, notebook: Notebook, order_id: int, order_id_taken: bool
+    ) -> None:
+        """
+        Check that a step with the given order ID can be added to a notebook.
+
+        Args:
+            notebook (Notebook): The notebook the step is added to.
+            order_id (int): The order ID of the new step.
+            order_id_taken (bool): Whether the notebook already has a step with the
+                                   same order ID.
+
+        Raises:
+            HTTPException: If the notebook is full or the order ID is already taken.
+        """
+        if notebook.step_count >= MAX_STEPS_PER_NOTEBOOK:
             raise HTTPException(
                 status_code=400, detail="Cannot exceed 100 steps per notebook."
             )
 
         # Ideally we would slot the new step in the correct order, but for now we'll make sure the order_id is unique
-        if any(step.order_id == order_id for step in steps):
+        if order_id_taken:
             raise HTTPException(
                 status_code=400,
                 detail=f"Order ID {order_id} already exists in this notebook.",
             )
 
+    def add_notebook_step(self, order_id: int, notebook_id: str) -> NotebookStep:
+        if get_settings().STEP_WRITE_BATCHING:
+            from src.api.notebook.batching import get_step_write_batcher
+
+            batcher = get_step_write_batcher(self.session.get_bind())
+            return batcher.add_notebook_step(order_id, notebook_id)
+
+        return self._add_notebook_step(order_id, notebook_id)
+
+    @serialized_write
+    def _add_notebook_step(self, order_id: int, notebook_id: str) -> NotebookStep:
+        notebook = self._get_notebook_for_update(notebook_id)
+
+        query = select(NotebookStep.step_id).where(
+            NotebookStep.notebook_id == notebook_id, NotebookStep.order_id == order_id
+        )
+        order_id_taken = self.session.exec(query).first() is not None
+        self._validate_new_step(notebook, order_id, order_id_taken)
+
         new_step = NotebookStep(
             order_id=order_id,
             notebook_id=notebook_id,
         )
+        notebook.step_count += 1
+        notebook.last_step_modified_at = new_step.modified_at
 
         self.session.add(new_step)
         self.session.commit()
@@ -97,12 +233,81 @@ class NotebookService:
 
         return new_step
 
+    @serialized_write
+    def add_notebook_steps(
+        self, new_steps: List[Tuple[int, str]]
+    ) -> List[NotebookStep | HTTPException]:
+        """
+        Add steps to one or more notebooks in a single transaction.
+
+        Every step is validated on its own, in order, so an invalid step does not stop
+        the others from being written.
+
+        Args:
+            new_steps (List[Tuple[int, str]]): (order_id, notebook_id) pairs.
+
+        Returns:
+            List[NotebookStep | HTTPException]: For each requested step, either the
+                                                created step or the error explaining
+                                                why it was rejected.
+        """
+        notebook_ids = sorted({notebook_id for _, notebook_id in new_steps})
+        order_ids = {order_id for order_id, _ in new_steps}
+
+        # Lock in primary key order so concurrent batches cannot deadlock
+        statement = (
+            select(Notebook)
+            .where(Notebook.id.in_(notebook_ids), Notebook.deleted_at.is_(None))
+            .order_by(Notebook.id)
+            .with_for_update()
+        )
+        notebooks = {notebook.id: notebook for notebook in self.session.exec(statement)}
+
+        query = (
+            select(NotebookStep.notebook_id, NotebookStep.order_id)
+            .where(
+                NotebookStep.notebook_id.in_(notebook_ids),
+                NotebookStep.order_id.in_(order_ids),
+            )
+            .execution_options(binary_fetch=True)
+        )
+        taken_order_ids = set(self.session.exec(query).all())
+
+        results = []
+        for order_id, notebook_id in new_steps:
+            notebook = notebooks.get(notebook_id)
+            if notebook is None:
+                results.append(
+                    HTTPException(status_code=404, detail="Notebook not found")
+                )
+                continue
+
+            try:
+                self._validate_new_step(
+                    notebook, order_id, (notebook_id, order_id) in taken_order_ids
+                )
+            except HTTPException as exc:
+                results.append(exc)
+                continue
+
+            new_step = NotebookStep(order_id=order_id, notebook_id=notebook_id)
+            notebook.step_count += 1
+            notebook.last_step_modified_at = new_step.modified_at
+            taken_order_ids.add((notebook_id, order_id))
+
+            self.session.add(new_step)
+            results.append(new_step)
+
+        self.session.commit()
+        return results
+
+    @serialized_write
     def reorder_notebook_steps(
         self, steps_order: List[Dict[str, int]], notebook_id: str
     ) -> List[NotebookStep]:
-        statement = select(NotebookStep).where(NotebookStep.notebook_id == notebook_id)
+        notebook = self._get_notebook_for_update(notebook_id)
         current_steps = {
-            step.step_id: step for step in self.session.exec(statement).all()
+            step.step_id: step for step in self.get_notebook_steps(notebook_id)
         }
 
         # Ensure there are no order_ids greater than 100
@@ -126,13 +331,186 @@ class NotebookService:
                 detail=f"Missing valid step IDs in the new order: {missing_steps}",
             )
 
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
         for new_step in steps_order:
             step_id, new_order_id = new_step["step_id"], new_step["order_id"]
             if step_id in current_steps:
                 current_steps[step_id].order_id = new_order_id
-                current_steps[step_id].modified_at = datetime.datetime.now(
-                    tz=datetime.timezone.utc
-                )
+                current_steps[step_id].modified_at = now
+                notebook.last_step_modified_at = now
 
         self.session.commit()
         return list(current_steps.values())
+
+    def rebuild_notebook_aggregates(self, batch_size: int = 500) -> int:
+        """
+        Recompute the step aggregates of every notebook from the steps table.
+
+        Notebooks are processed in primary key order, `batch_size` at a time, with one
+        short transaction per batch so the job never holds locks on the whole table.
+
+        Args:
+            batch_size (int): The number of notebooks to repair per transaction.
+
+        Returns:
+            int: The number of notebooks whose aggregates were out of date.
+        """
+        repaired = 0
+        last_id = ""
+        while True:
+            last_id, repaired_in_batch = self._rebuild_notebook_aggregates_batch(
+                last_id, batch_size
+            )
+            if last_id is None:
+                break
+
+            repaired += repaired_in_batch
+            logging.info(
+                "Rebuilt aggregates up to notebook %s (%d repaired so far)",
+                last_id,
+                repaired,
+            )
+
+        return repaired
+
+    @serialized_write
+    def _rebuild_notebook_aggregates_batch(
+        self, after_id: str, batch_size: int
+    ) -> Tuple[str | None, int]:
+        """
+        Recompute the step aggregates of one batch of notebooks in one transaction.
+
+        Args:
+            after_id (str): Only notebooks with a greater ID are processed.
+            batch_size (int): The number of notebooks to process.
+
+        Returns:
+            Tuple[str | None, int]: The last notebook ID processed (None when there
+                                    were no notebooks left) and the number of notebooks
+                                    whose aggregates were out of date.
+        """
+        statement = (
+            select(Notebook)
+            .where(Notebook.id > after_id)
+            .order_by(Notebook.id)
+            .limit(batch_size)
+            .with_for_update()
+        )
+        notebooks = self.session.exec(statement).all()
+        if not notebooks:
+            self.session.commit()
+            return None, 0
+
+        notebook_ids = [notebook.id for notebook in notebooks]
+        aggregates_query = (
+            select(
+                NotebookStep.notebook_id,
+                func.count(NotebookStep.step_id),
+                func.max(NotebookStep.modified_at),
+            )
+            .where(NotebookStep.notebook_id.in_(notebook_ids))
+            .group_by(NotebookStep.notebook_id)
+        )
+        aggregates = {
+            notebook_id: (step_count, last_step_modified_at)
+            for notebook_id, step_count, last_step_modified_at in self.session.exec(
+                aggregates_query
+            ).all()
+        }
+
+        repaired = 0
+        for notebook in notebooks:
+            step_count, last_step_modified_at = aggregates.get(notebook.id, (0, None))
+            if (
+                notebook.step_count != step_count
+                or notebook.last_step_modified_at != last_step_modified_at
+            ):
+                notebook.step_count = step_count
+                notebook.last_step_modified_at = last_step_modified_at
+                repaired += 1
+
+        self.session.commit()
+        return notebook_ids[-1], repaired
+
+    def get_notebooks_pending_purge(self, limit: int = 100) -> List[str]:
+        """
+        Retrieve the IDs of deleted notebooks that have not been purged yet.
+
+        Args:
+            limit (int): The maximum number of IDs to return.
+
+        Returns:
+            List[str]: The IDs, oldest deletion first.
+        """
+        statement = (
+            select(Notebook.id)
+            .where(Notebook.deleted_at.is_not(None))
+            .order_by(Notebook.deleted_at, Notebook.id)
+            .limit(limit)
+        )
+        return list(self.session.exec(statement).all())
+
+    def get_purge_backlog(self) -> tuple[int, int]:
+        """
+        Report how much work the background purge has left.
+
+        Relies on the step aggregates, which the purge keeps up to date as it
+        removes steps, so no step rows are scanned.
+
+        Returns:
+            tuple[int, int]: The number of notebooks and steps still to be purged.
+        """
+        statement = select(
+            func.count(Notebook.id), func.coalesce(func.sum(Notebook.step_count), 0)
+        ).where(Notebook.deleted_at.is_not(None))
+        notebooks, steps = self.session.exec(statement).one()
+        return notebooks, int(steps)
+
+    @serialized_write
+    def purge_notebook(self, notebook_id: str, batch_size: int = 500) -> int | None:
+        """
+        Remove one batch of a deleted notebook's data in its own short transaction.
+
+        Steps are deleted at most `batch_size` at a time; the notebook row itself is
+        removed once it has no steps left. Calling this again after an interruption
+        simply carries on where the previous call stopped.
+
+        Args:
+            notebook_id (str): The unique identifier of a deleted notebook.
+            batch_size (int): The maximum number of steps to delete.
+
+        Returns:
+            int | None: The number of steps deleted. 0 means the notebook row itself
+                        was removed. None means there was nothing to purge, e.g.
+                        because another worker already purged the notebook.
+        """
+        statement = (
+            select(Notebook)
+            .where(Notebook.id == notebook_id, Notebook.deleted_at.is_not(None))
+            .with_for_update()
+        )
+        notebook = self.session.exec(statement).first()
+        if notebook is None:
+            self.session.commit()
+            return None
+
+        batch = (
+            select(NotebookStep.step_id)
+            .where(NotebookStep.notebook_id == notebook_id)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        result = self.session.execute(
+            delete(NotebookStep)
+            .where(NotebookStep.step_id.in_(batch))
+            .execution_options(synchronize_session=False)
+        )
+        purged = result.rowcount
+
+        if purged:
+            notebook.step_count = max(notebook.step_count - purged, 0)
+        else:
+            self.session.execute(delete(Notebook).where(Notebook.id == notebook_id))
+
+        self.session.commit()
+        return purged
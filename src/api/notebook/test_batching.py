@@ -0,0 +1,146 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlmodel import Session
+
+from src.api.notebook.batching import StepWriteBatcher, close_step_write_batchers
+from src.api.notebook.models import Notebook
+from src.api.notebook.service import NotebookService
+from src.config import get_settings
+
+
+@pytest.fixture(autouse=True)
+def notebooks(engine):
+    """Fixture adding two empty notebooks to the database"""
+    with Session(engine) as session:
+        session.add(Notebook(id="1", name="Notebook 1"))
+        session.add(Notebook(id="2", name="Notebook 2"))
+        session.commit()
+
+
+@pytest.fixture
+def commits(engine):
+    """Fixture counting the transactions committed on the engine"""
+    commits = []
+    event.listen(engine, "commit", lambda connection: commits.append(connection))
+    return commits
+
+
+def add_steps_concurrently(batcher, new_steps):
+    def add_step(new_step):
+        try:
+            return batcher.add_notebook_step(*new_step)
+        except HTTPException as exc:
+            return exc
+
+    with ThreadPoolExecutor(max_workers=len(new_steps)) as executor:
+        return list(executor.map(add_step, new_steps))
+
+
+def test_concurrent_steps_are_written_in_one_transaction(engine, commits):
+    """Test concurrent inserts to different notebooks share a single commit"""
+    batcher = StepWriteBatcher(engine, max_items=4, max_wait=5)
+    new_steps = [(1, "1"), (2, "1"), (1, "2"), (2, "2")]
+
+    results = add_steps_concurrently(batcher, new_steps)
+    batcher.close()
+
+    assert sorted((step.notebook_id, step.order_id) for step in results) == [
+        ("1", 1),
+        ("1", 2),
+        ("2", 1),
+        ("2", 2),
+    ]
+    assert all(step.step_id is not None for step in results)
+    assert len(commits) == 1
+
+    with Session(engine) as session:
+        assert session.get(Notebook, "1").step_count == 2
+        assert session.get(Notebook, "2").step_count == 2
+
+
+def test_invalid_steps_fail_individually(engine):
+    """Test each caller in a batch gets its own error without failing the others"""
+    batcher = StepWriteBatcher(engine, max_items=3, max_wait=5)
+    new_steps = [(1, "1"), (1, "1"), (1, "999")]
+
+    results = add_steps_concurrently(batcher, new_steps)
+    batcher.close()
+
+    errors = sorted(
+        (result.status_code, result.detail)
+        for result in results
+        if isinstance(result, HTTPException)
+    )
+    assert errors == [
+        (400, "Order ID 1 already exists in this notebook."),
+        (404, "Notebook not found"),
+    ]
+
+    with Session(engine) as session:
+        assert session.get(Notebook, "1").step_count == 1
+
+
+def test_service_batches_writes_on_its_own_engine(engine, monkeypatch):
+    """Test batched inserts go to the database of the service's session"""
+    monkeypatch.setattr(get_settings(), "STEP_WRITE_BATCHING", True)
+
+    with Session(engine) as session:
+        step = NotebookService(session).add_notebook_step(1, "1")
+    close_step_write_batchers()
+
+    assert step.notebook_id == "1"
+    with Session(engine) as session:
+        assert session.get(Notebook, "1").step_count == 1
+
+
+def test_closed_batcher_rejects_steps(engine):
+    """Test inserts after closing fail instead of waiting forever"""
+    batcher = StepWriteBatcher(engine, max_wait=0)
+    batcher.add_notebook_step(1, "1")
+    batcher.close()
+
+    with pytest.raises(RuntimeError, match="closed"):
+        batcher.add_notebook_step(2, "1")
+
+    with Session(engine) as session:
+        assert session.get(Notebook, "1").step_count == 1
+
+
+def test_close_fails_steps_left_in_the_queue(engine):
+    """Test an insert queued behind the stop sentinel is failed on close"""
+    batcher = StepWriteBatcher(engine, max_wait=0)
+    batcher.add_notebook_step(1, "1")
+    future = Future()
+    batcher._queue.put(None)
+    batcher._queue.put((2, "1", future))
+
+    batcher.close()
+
+    with pytest.raises(RuntimeError, match="closed"):
+        future.result(timeout=1)
+
+
+def test_failed_batch_gives_each_caller_its_own_error(engine, monkeypatch):
+    """Test callers of a failed batch do not share one exception object"""
+
+    def fail(self, new_steps):
+        raise OSError("database is gone")
+
+    monkeypatch.setattr(NotebookService, "add_notebook_steps", fail)
+    batcher = StepWriteBatcher(engine, max_items=2, max_wait=5)
+
+    def add_step(new_step):
+        try:
+            batcher.add_notebook_step(*new_step)
+        except RuntimeError as exc:
+            return exc
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        errors = list(executor.map(add_step, [(1, "1"), (1, "2")]))
+    batcher.close()
+
+    assert errors[0] is not errors[1]
+    assert all(isinstance(error.__cause__, OSError) for error in errors)
@@ -52,8 +52,18 @@ def test_get_notebooks(mock_notebook_service, override_dependency):
     response = client.get("/notebooks/")
     assert response.status_code == 200
     assert response.json() == [
-        {"id": "1", "name": "Notebook 1"},
-        {"id": "2", "name": "Notebook 2"},
+        {
+            "id": "1",
+            "name": "Notebook 1",
+            "step_count": 0,
+            "last_step_modified_at": None,
+        },
+        {
+            "id": "2",
+            "name": "Notebook 2",
+            "step_count": 0,
+            "last_step_modified_at": None,
+        },
     ]
 
     mock_notebook_service.get_notebooks.assert_called_once()
@@ -69,7 +79,12 @@ def test_create_notebook(mock_notebook_service, override_dependency):
     response = client.post("/notebooks/", json=input_data)
 
     assert response.status_code == 201
-    assert response.json() == {"id": "1", "name": "New Notebook"}
+    assert response.json() == {
+        "id": "1",
+        "name": "New Notebook",
+        "step_count": 0,
+        "last_step_modified_at": None,
+    }
 
     mock_notebook_service.create_notebook.assert_called_once_with("New Notebook")
 
@@ -82,11 +97,38 @@ def test_get_notebook_by_id_success(mock_notebook_service, override_dependency):
 
     response = client.get("/notebooks/1")
     assert response.status_code == 200
-    assert response.json() == {"id": "1", "name": "Notebook 1"}
+    assert response.json() == {
+        "id": "1",
+        "name": "Notebook 1",
+        "step_count": 0,
+        "last_step_modified_at": None,
+    }
 
     mock_notebook_service.get_notebook_by_id.assert_called_once_with("1")
 
 
+def test_get_notebook_by_id_includes_step_aggregates(
+    mock_notebook_service, override_dependency
+):
+    """Test the GET /notebooks/{notebook_id} route exposes the step aggregates"""
+    last_step_modified_at = datetime.datetime(2024, 11, 4, 2, 2, 23)
+    mock_notebook_service.get_notebook_by_id.return_value = NotebookResponse(
+        id="1",
+        name="Notebook 1",
+        step_count=3,
+        last_step_modified_at=last_step_modified_at,
+    )
+
+    response = client.get("/notebooks/1")
+    assert response.status_code == 200
+    assert response.json() == {
+        "id": "1",
+        "name": "Notebook 1",
+        "step_count": 3,
+        "last_step_modified_at": last_step_modified_at.isoformat(),
+    }
+
+
 def test_get_notebook_by_id_not_found(mock_notebook_service, override_dependency):
     """Test the GET /notebooks/{notebook_id} route for a non-existent notebook"""
     mock_notebook_service.get_notebook_by_id.return_value = None
@@ -98,6 +140,45 @@ def test_get_notebook_by_id_not_found(mock_notebook_service, override_dependency
     mock_notebook_service.get_notebook_by_id.assert_called_once_with("999")
 
 
+def test_delete_notebook_success(mock_notebook_service, override_dependency):
+    """Test the DELETE /notebooks/{notebook_id} route for a live notebook"""
+    mock_notebook_service.delete_notebook.return_value = True
+
+    response = client.delete("/notebooks/1")
+    assert response.status_code == 204
+    assert response.content == b""
+
+    mock_notebook_service.delete_notebook.assert_called_once_with("1")
+
+
+def test_delete_notebook_not_found(mock_notebook_service, override_dependency):
+    """Test the DELETE /notebooks/{notebook_id} route for a non-existent notebook"""
+    mock_notebook_service.delete_notebook.return_value = False
+
+    response = client.delete("/notebooks/999")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Notebook not found"}
+
+
+def test_bulk_delete_notebooks(mock_notebook_service, override_dependency):
+    """Test the POST /notebooks/bulk-delete route"""
+    mock_notebook_service.delete_notebooks.return_value = ["1", "2"]
+
+    response = client.post("/notebooks/bulk-delete", json={"ids": ["1", "2", "999"]})
+    assert response.status_code == 200
+    assert response.json() == {"deleted_ids": ["1", "2"]}
+
+    mock_notebook_service.delete_notebooks.assert_called_once_with(["1", "2", "999"])
+
+
+def test_bulk_delete_notebooks_requires_ids(mock_notebook_service, override_dependency):
+    """Test the POST /notebooks/bulk-delete route rejects an empty list"""
+    response = client.post("/notebooks/bulk-delete", json={"ids": []})
+    assert response.status_code == 422
+
+    mock_notebook_service.delete_notebooks.assert_not_called()
+
+
 def test_add_step_to_notebook_success(mock_notebook_service, override_dependency):
     """Test the POST /notebooks/{notebook_id}/steps route"""
     mock_notebook_service.add_notebook_step.return_value = NotebookStepResponse(
@@ -117,6 +198,18 @@ def test_add_step_to_notebook_success(mock_notebook_service, override_dependency
     )
 
 
+def test_add_step_to_notebook_limit_reached(mock_notebook_service, override_dependency):
+    """Test the POST /notebooks/{notebook_id}/steps route when the notebook is full"""
+    mock_notebook_service.add_notebook_step.side_effect = HTTPException(
+        status_code=400, detail="Cannot exceed 100 steps per notebook."
+    )
+
+    response = client.post("/notebooks/1/steps/", json={"order_id": 101})
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Cannot exceed 100 steps per notebook."}
+
+
 def test_reorder_steps_in_notebook_success(mock_notebook_service, override_dependency):
     """Test successful reordering of notebook steps"""
     notebook_id = "1"
@@ -0,0 +1,241 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from src.api.notebook.jobs import purge_deleted_notebooks
+from src.api.notebook.models import Notebook, NotebookStep
+from src.api.notebook.service import MAX_STEPS_PER_NOTEBOOK, NotebookService
+
+
+@pytest.fixture
+def session(engine):
+    """Fixture for a session with a few empty notebooks"""
+    with Session(engine) as session:
+        for notebook_id in ("1", "2", "3", "4", "5"):
+            session.add(Notebook(id=notebook_id, name=f"Notebook {notebook_id}"))
+        session.commit()
+        yield session
+
+
+def test_add_notebook_step_updates_aggregates(session):
+    """Test adding steps keeps the notebook's step count and last change time"""
+    service = NotebookService(session)
+
+    service.add_notebook_step(1, "1")
+    last_step = service.add_notebook_step(2, "1")
+
+    notebook = session.get(Notebook, "1")
+    assert notebook.step_count == 2
+    assert notebook.last_step_modified_at == last_step.modified_at
+    assert session.get(Notebook, "2").step_count == 0
+
+
+def test_reorder_notebook_steps_updates_last_step_modified_at(session):
+    """Test reordering steps moves the notebook's last step change time"""
+    service = NotebookService(session)
+    first_step = service.add_notebook_step(1, "1")
+    second_step = service.add_notebook_step(2, "1")
+
+    steps = service.reorder_notebook_steps(
+        [
+            {"step_id": first_step.step_id, "order_id": 2},
+            {"step_id": second_step.step_id, "order_id": 1},
+        ],
+        "1",
+    )
+
+    notebook = session.get(Notebook, "1")
+    assert notebook.step_count == 2
+    assert notebook.last_step_modified_at == max(step.modified_at for step in steps)
+
+
+def test_add_notebook_step_rejects_step_beyond_limit(session):
+    """Test the 101st step of a notebook is rejected"""
+    service = NotebookService(session)
+    for order_id in range(1, MAX_STEPS_PER_NOTEBOOK + 1):
+        service.add_notebook_step(order_id, "1")
+
+    with pytest.raises(HTTPException) as exc_info:
+        service.add_notebook_step(MAX_STEPS_PER_NOTEBOOK + 1, "1")
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Cannot exceed 100 steps per notebook."
+    assert session.get(Notebook, "1").step_count == MAX_STEPS_PER_NOTEBOOK
+
+
+def test_add_notebook_step_checks_limit_with_step_count(session):
+    """Test the step limit is read from the step count, not by counting steps"""
+    session.get(Notebook, "1").step_count = MAX_STEPS_PER_NOTEBOOK
+    session.commit()
+
+    with pytest.raises(HTTPException) as exc_info:
+        NotebookService(session).add_notebook_step(1, "1")
+
+    assert exc_info.value.status_code == 400
+    assert session.exec(select(NotebookStep)).all() == []
+
+
+def test_rebuild_notebook_aggregates_repairs_drift(session):
+    """Test corrupted aggregates are rebuilt from the steps, batch by batch"""
+    service = NotebookService(session)
+    service.add_notebook_step(1, "1")
+    last_step = service.add_notebook_step(2, "1")
+    service.add_notebook_step(1, "4")
+
+    for notebook_id, step_count in (("1", 7), ("3", 3), ("4", 0), ("5", 1)):
+        session.get(Notebook, notebook_id).step_count = step_count
+    session.commit()
+
+    assert service.rebuild_notebook_aggregates(batch_size=2) == 4
+
+    notebooks = {
+        notebook.id: (notebook.step_count, notebook.last_step_modified_at)
+        for notebook in session.exec(select(Notebook)).all()
+    }
+    assert notebooks["1"] == (2, last_step.modified_at)
+    assert notebooks["2"] == (0, None)
+    assert notebooks["3"] == (0, None)
+    assert notebooks["4"][0] == 1
+    assert notebooks["5"] == (0, None)
+    assert service.rebuild_notebook_aggregates(batch_size=2) == 0
+
+
+@pytest.fixture
+def purge_engine(engine, monkeypatch):
+    """Fixture running the purge worker against the test database"""
+    monkeypatch.setattr("src.api.notebook.jobs.get_engine", lambda: engine)
+    return engine
+
+
+def add_steps(session, notebook_id, count):
+    service = NotebookService(session)
+    for order_id in range(1, count + 1):
+        service.add_notebook_step(order_id, notebook_id)
+
+
+def count_steps(session):
+    return session.exec(select(func.count(NotebookStep.step_id))).one()
+
+
+def test_delete_notebooks_hides_notebooks_from_reads(session):
+    """Test deleted notebooks are skipped by every read"""
+    service = NotebookService(session)
+
+    assert sorted(service.delete_notebooks(["1", "2"])) == ["1", "2"]
+
+    assert service.get_notebook_by_id("1") is None
+    assert sorted(notebook.id for notebook in service.get_notebooks()) == [
+        "3",
+        "4",
+        "5",
+    ]
+    with pytest.raises(HTTPException) as exc_info:
+        service.add_notebook_step(1, "1")
+    assert exc_info.value.status_code == 404
+
+
+def test_delete_notebooks_skips_unknown_and_deleted_ids(session):
+    """Test only live notebooks are reported as deleted"""
+    service = NotebookService(session)
+    assert service.delete_notebook("1")
+
+    assert service.delete_notebooks(["1", "2", "999"]) == ["2"]
+    assert not service.delete_notebook("1")
+    assert not service.delete_notebook("999")
+
+
+def test_purge_notebook_deletes_steps_in_batches(session):
+    """Test each purge call removes at most one batch of steps"""
+    add_steps(session, "1", 5)
+    add_steps(session, "2", 2)
+    service = NotebookService(session)
+    service.delete_notebook("1")
+
+    assert service.purge_notebook("1", batch_size=2) == 2
+    assert count_steps(session) == 5
+    assert service.get_purge_backlog() == (1, 3)
+
+    assert service.purge_notebook("1", batch_size=2) == 2
+    assert service.purge_notebook("1", batch_size=2) == 1
+    assert service.purge_notebook("1", batch_size=2) == 0
+
+    assert session.get(Notebook, "1") is None
+    assert count_steps(session) == 2
+    assert service.get_purge_backlog() == (0, 0)
+
+
+def test_purge_notebook_reports_nothing_to_purge(session):
+    """Test purging a live, unknown or already purged notebook does nothing"""
+    add_steps(session, "1", 1)
+    service = NotebookService(session)
+
+    assert service.purge_notebook("1") is None
+    assert service.purge_notebook("999") is None
+    assert count_steps(session) == 1
+
+    service.delete_notebook("1")
+    assert service.purge_notebook("1") == 1
+    assert service.purge_notebook("1") == 0
+    assert service.purge_notebook("1") is None
+
+
+def test_purge_deleted_notebooks_resumes_after_interruption(
+    session, purge_engine, monkeypatch
+):
+    """Test a purge stopped partway finishes on the next run"""
+    for notebook_id in ("1", "2", "3"):
+        add_steps(session, notebook_id, 5)
+    NotebookService(session).delete_notebooks(["1", "2", "3"])
+
+    purge_notebook = NotebookService.purge_notebook
+    calls = []
+
+    def interrupted_purge_notebook(self, notebook_id, batch_size=500):
+        if len(calls) == 4:
+            raise KeyboardInterrupt
+        calls.append(notebook_id)
+        return purge_notebook(self, notebook_id, batch_size)
+
+    monkeypatch.setattr(NotebookService, "purge_notebook", interrupted_purge_notebook)
+    with pytest.raises(KeyboardInterrupt):
+        purge_deleted_notebooks(batch_size=2, throttle=0)
+    monkeypatch.setattr(NotebookService, "purge_notebook", purge_notebook)
+
+    assert calls == ["1", "1", "1", "1"]
+    assert NotebookService(session).get_purge_backlog() == (2, 10)
+
+    assert purge_deleted_notebooks(batch_size=2, throttle=0) == 2
+
+    assert NotebookService(session).get_purge_backlog() == (0, 0)
+    assert count_steps(session) == 0
+    assert sorted(notebook.id for notebook in session.exec(select(Notebook))) == [
+        "4",
+        "5",
+    ]
+
+
+def test_purge_deleted_notebooks_skips_notebooks_purged_elsewhere(
+    session, purge_engine, monkeypatch
+):
+    """Test notebooks another worker purged first are not counted as purged"""
+    add_steps(session, "1", 2)
+    NotebookService(session).delete_notebooks(["1", "2"])
+    get_notebooks_pending_purge = NotebookService.get_notebooks_pending_purge
+
+    def get_notebooks_purged_elsewhere(self, limit=100):
+        notebook_ids = get_notebooks_pending_purge(self, limit)
+        if notebook_ids:
+            # Another worker purges the first notebook before this one gets to it
+            with Session(purge_engine) as other_session:
+                other_worker = NotebookService(other_session)
+                while other_worker.purge_notebook(notebook_ids[0]) is not None:
+                    pass
+        return notebook_ids
+
+    monkeypatch.setattr(
+        NotebookService, "get_notebooks_pending_purge", get_notebooks_purged_elsewhere
+    )
+
+    assert purge_deleted_notebooks(throttle=0) == 1
+    assert NotebookService(session).get_purge_backlog() == (0, 0)
@@ -0,0 +1,27 @@
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, create_engine
+
+from src.db.database import create_db_engine
+
+
+@pytest.fixture
+def engine():
+    """Fixture for an in-memory database shared across threads"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    """Fixture for a SQLite database file configured like the app's"""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'notebook.db'}")
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
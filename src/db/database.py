@@ -1,10 +1,354 @@
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import URL, event, make_url
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+from sqlalchemy.pool import QueuePool
 from sqlmodel import Session, create_engine
 
-from src.config import settings
+from src.config import get_settings
+
+
+def get_database_url(database_url: str, driver: str) -> URL:
+    """
+    Apply a Postgres driver to a database URL that does not name one.
+
+    URLs that already name a driver (e.g. `postgresql+psycopg://...`) are returned
+    unchanged, so the driver can be chosen either in `DATABASE_URL` or through the
+    `DATABASE_DRIVER` setting.
+
+    Args:
+        database_url (str): The database URL.
+        driver (str): The driver to use, e.g. "psycopg2" or "psycopg".
+
+    Returns:
+        URL: The URL with an explicit driver.
+    """
+    url = make_url(database_url)
+    if url.drivername == "postgresql":
+        url = url.set(drivername=f"postgresql+{driver}")
+    return url
+
+
+class StatementCacheStats:
+    """
+    Counts hits and misses of an engine's compiled statement cache.
+
+    A miss means SQLAlchemy had to compile the statement again. A steady stream of
+    misses once the cache is full means it is too small for the application's set of
+    queries and `DB_STATEMENT_CACHE_SIZE` should be raised.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.hits = 0
+        self.misses = 0
+        event.listen(engine, "after_cursor_execute", self._record)
+
+    @property
+    def size(self) -> int:
+        compiled_cache = self.engine._compiled_cache
+        return len(compiled_cache) if compiled_cache is not None else 0
+
+    @property
+    def capacity(self) -> int:
+        compiled_cache = self.engine._compiled_cache
+        return compiled_cache.capacity if compiled_cache is not None else 0
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": self.size,
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else None,
+        }
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if context is None:
+            return
+        if context.cache_hit is CACHE_HIT:
+            self.hits += 1
+        elif context.cache_hit is CACHE_MISS:
+            self.misses += 1
+            if self.misses % 1000 == 0 and self.size >= self.capacity:
+                logging.warning(
+                    "Compiled statement cache is full (%s); consider raising "
+                    "DB_STATEMENT_CACHE_SIZE",
+                    self.as_dict(),
+                )
+
+
+def _configure_psycopg(engine: Engine) -> None:
+    """
+    Enable server-side prepared statements and binary fetching for psycopg 3.
+
+    Queries executed `DB_PREPARE_THRESHOLD` times on a connection are prepared on the
+    server, so the hot service queries are parsed and planned once per connection.
+    Statements run with the `binary_fetch` execution option have their results sent
+    in the binary protocol, which is cheaper to produce and parse for wide step lists.
+    """
 
-SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+    settings = get_settings()
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    @event.listens_for(engine, "connect")
+    def set_prepare_options(dbapi_connection, connection_record):
+        dbapi_connection.prepare_threshold = (
+            settings.DB_PREPARE_THRESHOLD if settings.DB_PREPARED_STATEMENTS else None
+        )
+        dbapi_connection.prepared_max = settings.DB_PREPARED_MAX
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def set_binary_format(conn, cursor, statement, parameters, context, executemany):
+        if (
+            context is not None
+            and context.execution_options.get("binary_fetch")
+            and hasattr(cursor, "format")
+        ):
+            from psycopg.pq import Format
+
+            cursor.format = Format.BINARY
+
+
+def _configure_sqlite(engine: Engine) -> None:
+    """
+    Tune SQLite connections for a multi-threaded web app.
+
+    WAL mode lets readers run alongside the single writer, and the pragmas trade
+    some durability on power loss (`synchronous`) and memory (`mmap_size`,
+    `cache_size`) for speed. Transactions are started explicitly so the whole unit of
+    work, reads included, runs in one transaction as it does on Postgres.
+    """
+    settings = get_settings()
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        # Let SQLAlchemy emit BEGIN itself instead of pysqlite's implicit handling
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE:d}")
+        cursor.execute(f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE:d}")
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS:d}")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def begin_transaction(conn):
+        # Writers take the write lock up front, so they never fail upgrading a read
+        conn.exec_driver_sql(
+            "BEGIN IMMEDIATE" if getattr(_sqlite_writer, "active", False) else "BEGIN"
+        )
+
+
+_sqlite_write_lock = threading.RLock()
+_sqlite_writer = threading.local()
+
+
+@contextmanager
+def serialized_writes(session: Session) -> Iterator[None]:
+    """
+    Run a write transaction behind every other writer of a single-writer database.
+
+    SQLite allows one writer at a time. Rather than letting concurrent requests race
+    for the database lock (and fail or spin on `busy_timeout`), their write
+    transactions queue on a process-wide lock and run one after the other. A read
+    transaction the session opened before the lock was taken is ended first, since
+    its snapshot may predate another writer's commit and SQLite would refuse to turn
+    it into a write. The transaction is rolled back before the lock is released if
+    the block fails, so the next writer never finds it open. On Postgres this does
+    nothing.
+
+    Args:
+        session (Session): The session running the write transaction.
+    """
+    if session.get_bind().dialect.name != "sqlite":
+        yield
+        return
+
+    with _sqlite_write_lock:
+        nested = getattr(_sqlite_writer, "active", False)
+        if not nested and session.in_transaction():
+            session.commit()
+
+        _sqlite_writer.active = True
+        try:
+            yield
+        except BaseException:
+            session.rollback()
+            raise
+        finally:
+            _sqlite_writer.active = nested
+
+
+def get_pool_limits(connection_budget: int, workers: int) -> dict:
+    """
+    Split a global connection budget evenly between worker processes.
+
+    A graceful restart (SIGHUP) starts a full set of new workers before the old ones
+    have drained, so for up to `GRACEFUL_TIMEOUT` seconds twice as many workers hold
+    a pool. Every pool gets a share of half the budget, so the overlap stays within
+    it.
+
+    Args:
+        connection_budget (int): The most connections allowed across all workers. 0
+                                 means no budget.
+        workers (int): The number of worker processes.
+
+    Returns:
+        dict: The pool arguments for `create_engine`, empty when there is no budget.
+
+    Raises:
+        ValueError: If the budget is too small to give every worker a connection
+                    during a restart.
+    """
+    if not connection_budget:
+        return {}
+    if connection_budget < 2 * workers:
+        raise ValueError(
+            f"DB_CONNECTION_BUDGET of {connection_budget} cannot give each of "
+            f"{workers} workers a connection during a restart"
+        )
+    return {"pool_size": connection_budget // (2 * workers), "max_overflow": 0}
+
+
+_server_workers: int | None = None
+
+
+def set_server_workers(workers: int | None) -> None:
+    """
+    Mark this process as one of the production server's worker processes.
+
+    Engines created afterwards size their pools as one worker's share of
+    `DB_CONNECTION_BUDGET`. Every other process (the development server, jobs and
+    benchmarks) uses `DB_POOL_SIZE` instead.
+
+    Args:
+        workers (int | None): The number of worker processes of the server, or None
+                              for a standalone process.
+    """
+    global _server_workers
+    _server_workers = workers
+
+
+def create_db_engine(
+    database_url: str | URL | None = None, driver: str | None = None
+) -> Engine:
+    """
+    Create a database engine configured from the application settings.
+
+    Args:
+        database_url (str | URL | None): The database URL. Defaults to `DATABASE_URL`.
+        driver (str | None): The Postgres driver. Defaults to `DATABASE_DRIVER`.
+
+    Returns:
+        Engine: The configured engine.
+    """
+    settings = get_settings()
+    url = get_database_url(
+        database_url or settings.DATABASE_URL, driver or settings.DATABASE_DRIVER
+    )
+    engine_options = {}
+    if url.get_backend_name() == "postgresql":
+        if _server_workers is not None:
+            engine_options = get_pool_limits(
+                settings.DB_CONNECTION_BUDGET, _server_workers
+            )
+        elif settings.DB_POOL_SIZE:
+            engine_options = {"pool_size": settings.DB_POOL_SIZE, "max_overflow": 0}
+    elif url.get_backend_name() == "sqlite":
+        engine_options = {"connect_args": {"check_same_thread": False}}
+    engine = create_engine(
+        url, query_cache_size=settings.DB_STATEMENT_CACHE_SIZE, **engine_options
+    )
+    if engine.dialect.driver == "psycopg":
+        _configure_psycopg(engine)
+    elif engine.dialect.name == "sqlite":
+        _configure_sqlite(engine)
+    return engine
+
+
+_engine: Engine | None = None
+_statement_cache_stats: StatementCacheStats | None = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> Engine:
+    """
+    Return the application engine, creating it on first use.
+
+    The engine is never created at import time, so a server that preloads the app
+    before forking workers does not share pooled connections between processes;
+    each worker creates its own engine and pool the first time it needs one.
+
+    Returns:
+        Engine: The application engine.
+    """
+    global _engine, _statement_cache_stats
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_db_engine()
+                _statement_cache_stats = StatementCacheStats(engine)
+                _engine = engine
+    return _engine
+
+
+def get_statement_cache_stats() -> StatementCacheStats | None:
+    """
+    Return the compiled statement cache statistics of the application engine.
+
+    Returns:
+        StatementCacheStats | None: The statistics, or None before the engine exists.
+    """
+    return _statement_cache_stats
+
+
+def warm_up_engine(connections: int) -> None:
+    """
+    Open pooled connections ahead of the first requests.
+
+    The connections are checked out together, so the pool really holds that many
+    open connections afterwards, and each one runs a trivial query to prove the
+    database is reachable.
+
+    Args:
+        connections (int): The number of connections to open. Capped at the pool size.
+    """
+    engine = get_engine()
+    if isinstance(engine.pool, QueuePool):
+        connections = min(connections, engine.pool.size())
+
+    opened = []
+    try:
+        for _ in range(connections):
+            connection = engine.connect()
+            opened.append(connection)
+            connection.exec_driver_sql("SELECT 1")
+    finally:
+        for connection in opened:
+            connection.close()
+
+
+def dispose_engine(close: bool = True) -> None:
+    """
+    Discard the application engine so the next `get_engine` call creates a new one.
+
+    Args:
+        close (bool): Close the pooled connections. Pass False in a freshly forked
+                      process, where the connections belong to the parent.
+    """
+    global _engine, _statement_cache_stats
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose(close=close)
+        _engine = None
+        _statement_cache_stats = None
 
 
 def get_session():
@@ -21,5 +365,5 @@ def get_session():
     Yields:
         Session: The SQLModel session object.
     """
-    with Session(engine) as session:
+    with Session(get_engine()) as session:
         yield session
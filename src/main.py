@@ -1,6 +1,64 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 
+from src.api.health.router import router as health_router
 from src.api.notebook.router import router as notebook_router
+from src.config import get_settings
+from src.db.database import (
+    dispose_engine,
+    get_statement_cache_stats,
+    warm_up_engine,
+)
+
+MAX_WARM_UP_RETRY_SECONDS = 30.0
+
+
+async def warm_up(app: FastAPI) -> None:
+    """
+    Warm up the database pool and mark the app ready, retrying until it succeeds.
+
+    Args:
+        app (FastAPI): The application to mark ready.
+    """
+    delay = 0.5
+    while True:
+        try:
+            await run_in_threadpool(warm_up_engine, get_settings().DB_POOL_WARMUP)
+        except Exception:
+            logging.exception("Database warm-up failed, retrying in %.1fs", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_WARM_UP_RETRY_SECONDS)
+        else:
+            app.state.ready = True
+            return
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create the database engine when the app starts and dispose of it when it stops.
+
+    Settings and the engine are only created here, not at import time, so importing
+    the app stays cheap. Warm-up runs in the background: the app serves the liveness
+    probe straight away and reports ready once the pool is open. The compiled
+    statement cache statistics are logged on shutdown.
+
+    Args:
+        app (FastAPI): The application being started.
+    """
+    app.state.ready = False
+    warm_up_task = asyncio.create_task(warm_up(app))
+    yield
+    app.state.ready = False
+    warm_up_task.cancel()
+    statement_cache_stats = get_statement_cache_stats()
+    if statement_cache_stats is not None:
+        logging.info("Compiled statement cache: %s", statement_cache_stats.as_dict())
+    dispose_engine()
 
 
 def create_app() -> FastAPI:
@@ -14,10 +72,14 @@ def create_app() -> FastAPI:
         FastAPI: The configured FastAPI application instance.
     """
     app = FastAPI(
-        title="Notebook API", description="API for managing notebooks", version="1.0.0"
+        title="Notebook API",
+        description="API for managing notebooks",
+        version="1.0.0",
+        lifespan=lifespan,
     )
 
     app.include_router(notebook_router, prefix="/notebooks", tags=["notebooks"])
+    app.include_router(health_router, prefix="/health", tags=["health"])
 
     return app
 
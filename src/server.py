@@ -0,0 +1,146 @@
+import argparse
+import logging
+
+from gunicorn.app.base import BaseApplication
+from gunicorn.util import import_app
+
+from src.config import get_settings
+
+
+def post_fork(server, worker) -> None:
+    """
+    Give every worker its own engine and connection pool.
+
+    The app is preloaded in the master process, so anything created there before the
+    fork is shared by all workers. Dropping the engine without closing its connections
+    (they belong to the master) makes the worker create a fresh one on first use,
+    with a pool sized as the worker's share of `DB_CONNECTION_BUDGET`.
+    """
+    from src.db.database import dispose_engine, set_server_workers
+
+    dispose_engine(close=False)
+    set_server_workers(server.cfg.workers)
+
+
+def worker_exit(server, worker) -> None:
+    """
+    Flush queued step writes and close the worker's pooled connections.
+    """
+    from src.api.notebook.batching import close_step_write_batchers
+    from src.db.database import dispose_engine
+
+    close_step_write_batchers()
+    dispose_engine()
+
+
+def get_worker_count(workers: int, connection_budget: int) -> int:
+    """
+    Cap the number of workers so each one gets a connection from the budget.
+
+    A graceful restart runs the old and new workers side by side, so the budget has
+    to cover two connections per worker.
+
+    Args:
+        workers (int): The requested number of worker processes.
+        connection_budget (int): The most database connections allowed across all
+                                 workers. 0 means no budget.
+
+    Returns:
+        int: The number of worker processes to run.
+
+    Raises:
+        ValueError: If the budget cannot cover even a single worker.
+    """
+    if not connection_budget:
+        return workers
+
+    max_workers = connection_budget // 2
+    if not max_workers:
+        raise ValueError(
+            f"DB_CONNECTION_BUDGET of {connection_budget} is too small; a restart "
+            "needs at least 2 connections"
+        )
+    if workers > max_workers:
+        logging.warning(
+            "DB_CONNECTION_BUDGET of %d connections cannot give each of %d workers a "
+            "connection during a restart; running %d workers instead",
+            connection_budget,
+            workers,
+            max_workers,
+        )
+        return max_workers
+    return workers
+
+
+class NotebookServer(BaseApplication):
+    """
+    Production server running the app in several Uvicorn worker processes.
+
+    Runs on Gunicorn with the app preloaded in the master process, so workers start
+    by forking instead of importing the app again. Sending SIGHUP to the master
+    starts a full set of new workers and then stops the old ones; each old worker
+    stops accepting connections and has `GRACEFUL_TIMEOUT` seconds to finish its
+    in-flight requests. Both sets hold connection pools meanwhile, which the pool
+    sizes derived from `DB_CONNECTION_BUDGET` account for.
+    """
+
+    def __init__(self, app_uri: str, options: dict) -> None:
+        """
+        Initialize the server.
+
+        Args:
+            app_uri (str): The import path of the ASGI app, e.g. "src.main:app".
+            options (dict): Gunicorn settings.
+        """
+        self.app_uri = app_uri
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        return import_app(self.app_uri)
+
+
+def main() -> None:
+    settings = get_settings()
+    # SQLite has a single writer, and writes are only serialized within a process
+    sqlite = settings.DATABASE_URL.startswith("sqlite")
+
+    parser = argparse.ArgumentParser(description="Run the production server.")
+    parser.add_argument("--bind", default="0.0.0.0:8000")
+    parser.add_argument(
+        "--workers", type=int, default=1 if sqlite else settings.worker_count
+    )
+    args = parser.parse_args()
+    if sqlite and args.workers > 1:
+        logging.warning(
+            "Running %d workers on SQLite; writers in different processes will "
+            "contend on the database lock",
+            args.workers,
+        )
+
+    if not sqlite:
+        try:
+            args.workers = get_worker_count(args.workers, settings.DB_CONNECTION_BUDGET)
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    options = {
+        "bind": args.bind,
+        "workers": args.workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "graceful_timeout": settings.GRACEFUL_TIMEOUT,
+        "max_requests": settings.WORKER_MAX_REQUESTS,
+        "max_requests_jitter": settings.WORKER_MAX_REQUESTS // 10,
+        "post_fork": post_fork,
+        "worker_exit": worker_exit,
+    }
+    NotebookServer("src.main:app", options).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import logging
+
+import pytest
+
+from src.server import get_worker_count
+
+
+def test_get_worker_count_keeps_workers_within_budget():
+    """Test the requested workers run when the budget covers them"""
+    assert get_worker_count(8, 100) == 8
+    assert get_worker_count(8, 16) == 8
+    assert get_worker_count(8, 0) == 8
+
+
+def test_get_worker_count_caps_workers_to_budget(caplog):
+    """Test workers are capped, with a warning, when the budget is too small"""
+    with caplog.at_level(logging.WARNING):
+        assert get_worker_count(8, 9) == 4
+
+    assert "running 4 workers instead" in caplog.text
+
+
+def test_get_worker_count_rejects_budget_below_one_worker():
+    """Test a budget too small for a single restarting worker is refused"""
+    with pytest.raises(ValueError):
+        get_worker_count(8, 1)